@@ -15,7 +15,8 @@ from utils import (
     FaceRecognitionHandler, 
     MemoryChatbot, 
     configure_logging, 
-    validate_image
+    validate_image,
+    json_list_response
 )
 
 # Load environment variables
@@ -29,11 +30,16 @@ app = Flask(__name__)
 CORS(app)
 
 # Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = r'sqlite:///C:/Users/fmave/MemoryAssist/backend/instance/memory_assist.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv(
+    'DATABASE_URL', r'sqlite:///C:/Users/fmave/MemoryAssist/backend/instance/memory_assist.db'
+)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(__file__), 'uploads')
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# List responses are compressed above this size (bytes)
+app.config['COMPRESS_MIN_SIZE'] = 1024
+
 # Initialize database
 db = SQLAlchemy(app)
 
@@ -191,7 +197,8 @@ def add_person():
 def get_people():
     try:
         people = Person.query.order_by(Person.created_at.desc()).all()
-        return jsonify([person.to_dict() for person in people]), 200
+        db.session.close()  # Release the connection before streaming to the client
+        return json_list_response(people, Person.to_dict, app.config['COMPRESS_MIN_SIZE']), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -323,8 +330,12 @@ def add_task():
 @app.route('/api/tasks', methods=['GET'])
 def get_tasks():
     try:
-        tasks = Task.query.order_by(Task.created_at.desc()).all()
-        return jsonify([task.to_dict() for task in tasks]), 200
+        # Load repeat days in one query instead of one query per task
+        tasks = Task.query.options(
+            db.selectinload(Task.repeat_days_rel)
+        ).order_by(Task.created_at.desc()).all()
+        db.session.close()  # Release the connection before streaming to the client
+        return json_list_response(tasks, Task.to_dict, app.config['COMPRESS_MIN_SIZE']), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -374,7 +385,8 @@ def add_memory():
 def get_memories():
     try:
         memories = MemoryLog.query.order_by(MemoryLog.timestamp.desc()).all()
-        return jsonify([memory.to_dict() for memory in memories]), 200
+        db.session.close()  # Release the connection before streaming to the client
+        return json_list_response(memories, MemoryLog.to_dict, app.config['COMPRESS_MIN_SIZE']), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
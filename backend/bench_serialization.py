@@ -0,0 +1,117 @@
+"""
+Benchmark list serialization for the memories and tasks API routes
+
+Compares the previous approach (load every row, build dicts, jsonify)
+against the streamed, optionally compressed responses, reporting
+response time and bytes on the wire for each Accept-Encoding. Tasks also
+get a jsonify baseline using the route's selectinload query, so the
+serialization layer is measured separately from the N+1 query fix.
+
+Usage (from the backend directory):
+    python bench_serialization.py [rows] [repeats]
+"""
+import os
+import sys
+import time
+import tempfile
+import statistics
+
+# Point the app at a throwaway database before it is imported
+DB_DIR = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(DB_DIR, 'bench.db')
+
+from flask import jsonify
+import utils
+from app import app, db, MemoryLog, Task, TaskRepeatDay, get_memories, get_tasks
+
+ENCODINGS = ['identity', 'gzip', 'br']
+
+def seed(rows):
+    """
+    Fill the database with rows memories and rows tasks
+    
+    :param rows: Number of rows per table
+    """
+    db.create_all()
+    db.session.add_all(
+        MemoryLog(title=f'Memory {i}', content=f'Visited the park with family, entry number {i}. ' * 3)
+        for i in range(rows)
+    )
+    tasks = [
+        Task(name=f'Task {i}', description=f'Take medication {i}', repeat_type='weekly', repeat_time='09:00')
+        for i in range(rows)
+    ]
+    db.session.add_all(tasks)
+    db.session.flush()
+    db.session.add_all(
+        TaskRepeatDay(task_id=task.id, day_of_week=day)
+        for task in tasks for day in ('monday', 'thursday')
+    )
+    db.session.commit()
+
+def baseline_memories():
+    memories = MemoryLog.query.order_by(MemoryLog.timestamp.desc()).all()
+    return jsonify([memory.to_dict() for memory in memories])
+
+def baseline_tasks():
+    tasks = Task.query.order_by(Task.created_at.desc()).all()
+    return jsonify([task.to_dict() for task in tasks])
+
+def baseline_tasks_selectinload():
+    # Same query as get_tasks, so only the serialization layer differs
+    tasks = Task.query.options(
+        db.selectinload(Task.repeat_days_rel)
+    ).order_by(Task.created_at.desc()).all()
+    return jsonify([task.to_dict() for task in tasks])
+
+def measure(view, encoding, repeats):
+    """
+    Time a view end to end, including consuming a streamed body
+    
+    :return: Tuple (median seconds, body bytes)
+    """
+    timings = []
+    for _ in range(repeats):
+        with app.test_request_context(headers={'Accept-Encoding': encoding}):
+            start = time.perf_counter()
+            response = app.make_response(view())
+            body = response.get_data()
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(body)
+
+def report(label, view, encoding, repeats):
+    seconds, size = measure(view, encoding, repeats)
+    print(f'{label:<38} {encoding:<9} {seconds * 1000:>9.1f} ms {size:>11,} B')
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    
+    with app.app_context():
+        seed(rows)
+    
+    print(f'{rows} rows, median of {repeats} runs')
+    print(f'orjson: {"yes" if utils.orjson else "no"}, brotli: {"yes" if utils.brotli else "no"}\n')
+    
+    encoder = utils.orjson
+    for name, baselines, view in [
+        ('memories', [('jsonify', baseline_memories)], get_memories),
+        ('tasks', [
+            ('jsonify', baseline_tasks),
+            ('jsonify + selectinload', baseline_tasks_selectinload),
+        ], get_tasks),
+    ]:
+        for label, baseline in baselines:
+            report(f'{name} before ({label})', baseline, 'identity', repeats)
+        for encoding in ENCODINGS:
+            if encoding == 'br' and utils.brotli is None:
+                continue
+            report(f'{name} streamed', view, encoding, repeats)
+        if encoder is not None:
+            utils.orjson = None
+            report(f'{name} streamed (stdlib json)', view, 'identity', repeats)
+            utils.orjson = encoder
+        print()
+
+if __name__ == '__main__':
+    main()
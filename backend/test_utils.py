@@ -0,0 +1,110 @@
+import gzip
+import json
+import logging
+
+import pytest
+from flask import Flask
+
+import utils
+from utils import iter_json_array, json_list_response
+
+app = Flask(__name__)
+
+EMPTY = []
+ONE_ROW = [{'id': 1, 'title': 'Park visit'}]
+MANY_ROWS = [{'id': i, 'title': f'Memory {i}', 'content': 'x' * 50} for i in range(200)]
+
+def decode(response):
+    body = response.get_data()
+    encoding = response.headers.get('Content-Encoding')
+    if encoding == 'gzip':
+        body = gzip.decompress(body)
+    elif encoding == 'br':
+        body = utils.brotli.decompress(body)
+    return json.loads(body)
+
+def get(rows, accept_encoding, serializer=dict, **kwargs):
+    with app.test_request_context(headers={'Accept-Encoding': accept_encoding}):
+        response = json_list_response(rows, serializer, **kwargs)
+        response.get_data()  # Consume the stream while the context is active
+        return response
+
+@pytest.mark.parametrize('rows', [EMPTY, ONE_ROW, MANY_ROWS])
+@pytest.mark.parametrize('chunk_size', [1, 64, 16384])
+def test_iter_json_array_round_trip(rows, chunk_size):
+    chunks = list(iter_json_array(rows, dict, chunk_size))
+    assert json.loads(b''.join(chunks)) == rows
+
+@pytest.mark.parametrize('rows', [EMPTY, ONE_ROW, MANY_ROWS])
+@pytest.mark.parametrize('accept_encoding', ['identity', 'gzip', 'br'])
+def test_json_list_response_round_trip(rows, accept_encoding):
+    if accept_encoding == 'br' and utils.brotli is None:
+        pytest.skip('brotli is not installed')
+    response = get(rows, accept_encoding, min_size=1, chunk_size=256)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert 'Accept-Encoding' in response.vary
+    assert decode(response) == rows
+
+def test_json_list_response_round_trip_with_stdlib_json(monkeypatch):
+    monkeypatch.setattr(utils, 'orjson', None)
+    response = get(MANY_ROWS, 'gzip', min_size=1, chunk_size=256)
+    assert decode(response) == MANY_ROWS
+
+def test_small_body_is_not_compressed():
+    response = get(ONE_ROW, 'gzip, br')
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.vary
+    assert response.is_streamed is False
+    assert decode(response) == ONE_ROW
+
+def test_large_body_is_streamed_and_compressed():
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        response = json_list_response(MANY_ROWS, dict, min_size=1024)
+        assert response.is_streamed is True
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert decode(response) == MANY_ROWS
+
+@pytest.mark.parametrize('accept_encoding, expected', [
+    ('gzip;q=0', None),
+    ('identity', None),
+    ('', None),
+    ('gzip', 'gzip'),
+    ('*', 'br'),
+    ('gzip;q=1, br;q=0.5', 'gzip'),
+    ('gzip, br', 'br'),
+    ('br;q=0, gzip', 'gzip'),
+])
+def test_negotiation(accept_encoding, expected):
+    if expected == 'br' and utils.brotli is None:
+        expected = 'gzip'
+    response = get(MANY_ROWS, accept_encoding)
+    assert response.headers.get('Content-Encoding') == expected
+    assert 'Accept-Encoding' in response.vary
+    assert decode(response) == MANY_ROWS
+
+def test_negotiation_without_brotli(monkeypatch):
+    monkeypatch.setattr(utils, 'brotli', None)
+    response = get(MANY_ROWS, 'br')
+    assert 'Content-Encoding' not in response.headers
+    assert decode(response) == MANY_ROWS
+
+def failing_serializer(fail_at):
+    def serializer(row):
+        if row['id'] == fail_at:
+            raise ValueError('bad row')
+        return row
+    return serializer
+
+def test_error_in_small_body_propagates():
+    with app.test_request_context():
+        with pytest.raises(ValueError):
+            json_list_response(ONE_ROW, failing_serializer(1))
+
+def test_error_mid_stream_is_logged_and_raised(caplog):
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        response = json_list_response(MANY_ROWS, failing_serializer(150), chunk_size=1024)
+        assert response.is_streamed is True
+        with caplog.at_level(logging.ERROR), pytest.raises(ValueError):
+            response.get_data()
+    assert 'Error streaming JSON response' in caplog.text
@@ -4,6 +4,21 @@ import face_recognition
 import numpy as np
 from PIL import Image
 import io
+import json
+import zlib
+import itertools
+from flask import Response, request, stream_with_context
+
+# Optional accelerators: orjson for encoding, brotli for compression
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 class FaceRecognitionHandler:
     def __init__(self, known_people_dir='known_faces'):
@@ -220,3 +235,121 @@ def validate_image(file, max_size_mb=5):
     
     except Exception as e:
         return False, f"Invalid image file: {str(e)}"
+
+def dumps_json(obj):
+    """
+    Encode an object as compact JSON bytes, using orjson when available
+    
+    :param obj: JSON-serializable object
+    :return: Encoded bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def iter_json_array(rows, serializer, chunk_size=16384):
+    """
+    Encode rows as a JSON array, yielding it in chunks of roughly chunk_size bytes
+    
+    :param rows: Iterable of rows
+    :param serializer: Callable turning a row into a JSON-serializable object
+    :param chunk_size: Approximate number of bytes per yielded chunk
+    """
+    buffer = [b'[']
+    size = 1
+    for index, row in enumerate(rows):
+        encoded = dumps_json(serializer(row))
+        if index:
+            buffer.append(b',')
+        buffer.append(encoded)
+        size += len(encoded) + 1
+        if size >= chunk_size:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    buffer.append(b']')
+    yield b''.join(buffer)
+
+def negotiate_encoding(accept_encodings):
+    """
+    Pick the best supported content encoding for a request
+    
+    :param accept_encodings: Parsed Accept-Encoding header
+    :return: 'br', 'gzip' or None
+    """
+    supported = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return accept_encodings.best_match(supported)
+
+def compress_stream(chunks, encoding):
+    """
+    Compress an iterable of byte chunks incrementally
+    
+    :param chunks: Iterable of bytes
+    :param encoding: 'br' or 'gzip'
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=5)
+        compress, flush = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip container
+        compress, flush = compressor.compress, compressor.flush
+    
+    for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield flush()
+
+def _log_stream_errors(chunks):
+    """
+    Log errors raised while streaming a response body before re-raising them
+    
+    :param chunks: Iterable of bytes
+    """
+    try:
+        yield from chunks
+    except Exception as e:
+        logging.error(f"Error streaming JSON response, connection aborted: {e}")
+        raise
+
+def json_list_response(rows, serializer, min_size=1024, chunk_size=16384):
+    """
+    Build a response streaming rows as a JSON array, compressed when large
+    
+    Bodies smaller than min_size are built in full before returning, so any
+    error still propagates to the caller. Larger bodies are streamed with
+    gzip or brotli depending on the client's Accept-Encoding; an error after
+    streaming starts is logged and aborts the connection, since the 200
+    status has already been sent and cannot be turned into a 500.
+    
+    :param rows: Rows already fetched from the database
+    :param serializer: Callable turning a row into a JSON-serializable object
+    :param min_size: Minimum body size in bytes before compressing
+    :param chunk_size: Approximate number of bytes per streamed chunk
+    :return: Flask Response
+    """
+    chunks = iter_json_array(rows, serializer, chunk_size)
+    
+    # Buffer until we know whether the body is large enough to compress
+    head = []
+    size = 0
+    for chunk in chunks:
+        head.append(chunk)
+        size += len(chunk)
+        if size >= min_size:
+            break
+    else:
+        response = Response(b''.join(head), mimetype='application/json')
+        response.vary.add('Accept-Encoding')
+        return response
+    
+    body = _log_stream_errors(itertools.chain(head, chunks))
+    encoding = negotiate_encoding(request.accept_encodings)
+    if encoding:
+        body = compress_stream(body, encoding)
+    
+    response = Response(stream_with_context(body), mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response